@@ -1,18 +1,27 @@
+import argparse
+import io
+import json
+import os
 import time
 import re
-from collections import OrderedDict
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from operator import itemgetter
+import numpy as np
 import requests
-from lxml import html
+from requests.adapters import HTTPAdapter
+from lxml import etree
+from lxml.cssselect import CSSSelector
 from selenium import webdriver
-from selenium.webdriver import Keys
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException, WebDriverException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
-from tabulate import tabulate
-from webdriver_manager.chrome import ChromeDriverManager
+from urllib3.util.retry import Retry
 
 import credentials
 
@@ -23,14 +32,123 @@ USERNAME = credentials.USERNAME
 PASSWORD = credentials.PASSWORD
 CARD_NAME = credentials.CARD_NAME
 
-USERNAME_XPATH = '//*[@id="usernameCrtl"]'
-PASSWORD_XPATH = '//*[@id="passwordCtrl"]'
+USERNAME_ID = "usernameCrtl"
+PASSWORD_ID = "passwordCtrl"
+PASSWORD_XPATH = f'//*[@id="{PASSWORD_ID}"]'
+# Fills in both credentials and submits the form in a single WebDriver round trip.
+# The input events are needed so the page's form bindings pick up the new values.
+# Arguments: username field id, password field id, username, password.
+LOGIN_SCRIPT = """
+const [usernameId, passwordId, username, password] = arguments;
+const usernameField = document.getElementById(usernameId);
+const passwordField = document.getElementById(passwordId);
+if (!usernameField || !passwordField) {
+    throw new Error(`Login fields #${usernameId} / #${passwordId} not found on the page`);
+}
+if (!passwordField.form) {
+    throw new Error(`Password field #${passwordId} is not inside a form; the login page has changed`);
+}
+const setValue = (el, value) => {
+    el.value = value;
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+};
+setValue(usernameField, username);
+setValue(passwordField, password);
+passwordField.form.requestSubmit();
+"""
 MY_CARD_XPATH = f'//*[@id="carousel-inner"]//div[contains(@aria-label, "card named {CARD_NAME}")]'
 TRAVEL_DATA_XPATH = ('//*[@id="tni-opal-activity-tab-content-container"]/div/div/tni-page-frame/'
                      'div/div/tni-card-activities/div/div[2]')
 TRAVEL_DATA_ACTIVITIES_XPATH = (
     "//div[@class='date']"
 )
+# Serializes the element at the given XPath in the page, avoiding a find_element + get_attribute pair
+OUTER_HTML_SCRIPT = """
+return document.evaluate(arguments[0], document, null,
+                         XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue.outerHTML;
+"""
+
+# Weekday names in display order, indexed like datetime.weekday()
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# One record per travel activity, used for computing the weekly totals
+ACTIVITY_DTYPE = np.dtype([("date", "datetime64[D]"), ("fare", "f8"), ("is_topup", "?")])
+
+# Balance and pending top-up amounts in the card's aria-label
+_BAL_RE = re.compile(r'balance\s*\$([0-9.]+)', re.IGNORECASE)
+_PEND_RE = re.compile(r'pending\s*\$([0-9.]+)', re.IGNORECASE)
+
+# Precompiled selectors used by parse_travel_data. CSS class selectors match whole
+# class tokens instead of doing a contains() substring scan over the class attribute.
+_DATE_CONTAINER_CLASS = 'activity-by-date-container'
+_DATE = CSSSelector('div.activity-date')
+_ACTIVITIES = CSSSelector('li.ng-star-inserted')
+_TIME = etree.XPath('.//div[@class="date"]')
+_FROM = CSSSelector('span.from')
+_TO = CSSSelector('span.to')
+_AMOUNT = CSSSelector('div.amount > span')
+# Direct text children of an element. Unlike Element.text this still finds text that
+# comes after a leading child, such as the <!----> comment anchors Angular inserts.
+_TEXT = etree.XPath('text()')
+
+# Requests Chrome doesn't need to make to get at the balance and travel data
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg",
+    "*.woff*", "*.ttf",
+    "*google-analytics*", "*doubleclick*",
+]
+
+# Shared HTTP session so the healthcheck pings and the API POST reuse their connections,
+# which matters most when running as a long-lived process with --serve
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=2,
+                                       max_retries=Retry(total=2, backoff_factor=0.2)))
+
+# Resolved chromedriver path, cached so ChromeDriverManager doesn't hit the network every run
+CHROMEDRIVER_ENV_VAR = "OPAL_CHROMEDRIVER"
+DRIVER_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "opal", "driver.json")
+
+# Delay between balance checks when running as a long-lived process (--serve)
+SERVE_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+def load_cached_driver_path():
+    """
+    Returns a previously resolved chromedriver path, or None on a cache miss.
+
+    The OPAL_CHROMEDRIVER environment variable takes precedence over the cache file.
+    A cached entry is only used if the binary still exists and hasn't been replaced.
+    A Chrome update that the cached driver no longer supports is caught when the
+    driver is launched (see initialize_driver).
+    """
+    env_path = os.environ.get(CHROMEDRIVER_ENV_VAR)
+    if env_path and os.path.isfile(env_path):
+        return env_path
+
+    try:
+        with open(DRIVER_CACHE_PATH) as f:
+            cache = json.load(f)
+        driver_path = cache["driver_path"]
+        if os.path.isfile(driver_path) and os.path.getmtime(driver_path) == cache["mtime"]:
+            return driver_path
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def save_cached_driver_path(driver_path: str) -> None:
+    """Records the resolved chromedriver path so later runs can skip ChromeDriverManager."""
+    try:
+        os.makedirs(os.path.dirname(DRIVER_CACHE_PATH), exist_ok=True)
+        with open(DRIVER_CACHE_PATH, "w") as f:
+            json.dump({
+                "driver_path": driver_path,
+                "mtime": os.path.getmtime(driver_path),
+            }, f)
+    except OSError:
+        # A cache we can't write just means the next run resolves the driver again
+        pass
 
 
 def initialize_driver() -> webdriver.Chrome:
@@ -39,9 +157,37 @@ def initialize_driver() -> webdriver.Chrome:
     chrome_options.add_argument(f"user-data-dir={CHROME_PROFILE_PATH}")
     chrome_options.add_argument("--headless=new")
     chrome_options.add_argument("--window-size=1920,1080")
-
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    # Return from driver.get() once the DOM is ready; the explicit waits cover the rest
+    chrome_options.page_load_strategy = "eager"
+
+    driver = None
+    cached_path = load_cached_driver_path()
+    if cached_path:
+        try:
+            driver = webdriver.Chrome(service=Service(executable_path=cached_path), options=chrome_options)
+        except SessionNotCreatedException as e:
+            # Only a driver/browser version mismatch is fixed by resolving a new driver;
+            # anything else (e.g. the profile being locked by another run) would just fail again
+            if "version" not in (e.msg or "").lower():
+                raise
+            print(f"Cached chromedriver {cached_path} doesn't match Chrome, resolving a new one: {e.msg}",
+                  file=sys.stderr)
+
+    if driver is None:
+        # Only needed on a cache miss, and slow to import
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        driver_path = ChromeDriverManager().install()
+        driver = webdriver.Chrome(service=Service(executable_path=driver_path), options=chrome_options)
+        save_cached_driver_path(driver_path)
+
+    # Skip images, fonts and trackers; none of them are needed for the scraped data
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
     return driver
 
 
@@ -49,10 +195,7 @@ def login(driver: webdriver.Chrome) -> None:
     """Logs into the website using the provided credentials.py."""
     driver.get(LOGIN_URL)
     WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, PASSWORD_XPATH)))
-
-    driver.find_element(By.XPATH, USERNAME_XPATH).send_keys(USERNAME)
-    driver.find_element(By.XPATH, PASSWORD_XPATH).send_keys(PASSWORD)
-    driver.find_element(By.XPATH, PASSWORD_XPATH).send_keys(Keys.RETURN)
+    driver.execute_script(LOGIN_SCRIPT, USERNAME_ID, PASSWORD_ID, USERNAME, PASSWORD)
 
 
 def extract_balance_info(aria_label_text: str):
@@ -62,8 +205,8 @@ def extract_balance_info(aria_label_text: str):
     Returns:
         tuple: (balance, pending) as floats or None if not found.
     """
-    balance_match = re.search(r'balance\s*\$([0-9.]+)', aria_label_text, re.IGNORECASE)
-    pending_match = re.search(r'pending\s*\$([0-9.]+)', aria_label_text, re.IGNORECASE)
+    balance_match = _BAL_RE.search(aria_label_text)
+    pending_match = _PEND_RE.search(aria_label_text)
     balance = float(balance_match.group(1)) if balance_match else 0
     pending = float(pending_match.group(1)) if pending_match else 0
     return balance, pending
@@ -78,6 +221,23 @@ def get_balance(driver: webdriver.Chrome):
     return extract_balance_info(aria_label_text)
 
 
+def activity_count_stable():
+    """
+    Returns a WebDriverWait condition that is satisfied once the number of travel
+    activities on the page is the same on two consecutive polls.
+    """
+    previous_count = -1
+
+    def condition(driver: webdriver.Chrome) -> bool:
+        nonlocal previous_count
+        count = len(driver.find_elements(By.XPATH, TRAVEL_DATA_ACTIVITIES_XPATH))
+        stable = count == previous_count
+        previous_count = count
+        return stable
+
+    return condition
+
+
 def get_travel_data_html(driver: webdriver.Chrome) -> str:
     """
     Waits for and extracts the HTML content containing travel data.
@@ -87,95 +247,142 @@ def get_travel_data_html(driver: webdriver.Chrome) -> str:
     """
     WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, TRAVEL_DATA_XPATH)))
     WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, TRAVEL_DATA_ACTIVITIES_XPATH)))
-    time.sleep(2)
-    element = driver.find_element(By.XPATH, TRAVEL_DATA_XPATH)
-    return element.get_attribute("outerHTML")
+    try:
+        # Wait for the activity list to finish rendering instead of sleeping for a fixed time
+        WebDriverWait(driver, 5, poll_frequency=0.15).until(activity_count_stable())
+    except TimeoutException:
+        # Still changing after the timeout; take what has rendered so far
+        pass
+    return driver.execute_script(OUTER_HTML_SCRIPT, TRAVEL_DATA_XPATH)
+
+
+def first_text(elements: list, default: str = None):
+    """
+    Returns the first text node across the given elements, stripped, or default
+    if none of them contain any text.
+    """
+    for element in elements:
+        texts = _TEXT(element)
+        if texts:
+            return texts[0].strip()
+    return default
+
+
+def parse_minute_of_day(time_str: str) -> int:
+    """Converts an "HH:MM" time to minutes since midnight, or 0 if it's empty or malformed."""
+    hours, _, minutes = time_str.partition(":")
+    try:
+        return int(hours) * 60 + int(minutes)
+    except ValueError:
+        return 0
+
+
+def iter_date_containers(travel_html: str):
+    """
+    Stream-parses the travel data HTML and yields each activity-by-date container
+    once its subtree is complete.
+
+    Containers are cleared once the caller is done with them, so only one date
+    section is kept in memory at a time.
+    """
+    context = etree.iterparse(io.BytesIO(travel_html.encode("utf-8")), events=("end",),
+                              tag="div", html=True, encoding="utf-8")
+    for _, element in context:
+        if _DATE_CONTAINER_CLASS not in element.get("class", "").split():
+            continue
+        yield element
+
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
 
 
-def parse_travel_data(tree) -> OrderedDict:
+def parse_travel_data(travel_html: str) -> dict:
     """
-    Parses travel data from an HTML tree and returns an ordered dictionary
-    with dates as keys (formatted as "%A %d %b %Y") and a list of activities as values.
+    Parses travel data from the travel data HTML and returns a dictionary
+    with dates as keys (datetime objects, newest first) and a list of activities as values.
     """
-    travel_data = {}
+    records = []
 
-    # Find all activity containers (each date section)
-    date_containers = tree.xpath('//div[contains(@class, "activity-by-date-container")]')
-    for date_container in date_containers:
-        date_element = date_container.xpath('.//div[contains(@class, "activity-date")]/text()')
-        if not date_element:
+    # Walk all activity containers (each date section)
+    for date_container in iter_date_containers(travel_html):
+        date_str = first_text(_DATE(date_container))
+        if date_str is None:
             continue
-        date_str = date_element[0].strip()
         try:
             date_obj = datetime.strptime(date_str, "%A %d %b %Y")
         except ValueError:
             continue  # Skip unexpected date formats
 
-        travel_data[date_obj] = []
+        day_activities = []
 
         # Find all travel activities within the container
-        activities = date_container.xpath('.//li[contains(@class, "ng-star-inserted")]')
+        activities = _ACTIVITIES(date_container)
         for activity in activities:
             # Extract time
-            time_element = activity.xpath('.//div[@class="date"]/text()')
-            time_str = time_element[0].strip() if time_element else "00:00"
+            time_str = first_text(_TIME(activity), "00:00")
+            minute_of_day = parse_minute_of_day(time_str)
 
             # Extract start and end points
-            start_point_element = activity.xpath('.//span[contains(@class, "from")]/text()')
-            end_point_element = activity.xpath('.//span[contains(@class, "to")]/text()')
-            start_point = start_point_element[0].strip() if start_point_element else "Unknown"
-            end_point = end_point_element[0].strip() if end_point_element else "Unknown"
+            start_point = first_text(_FROM(activity), "Unknown")
+            end_point = first_text(_TO(activity), "Unknown")
 
             # Extract fare
-            fare_element = activity.xpath('.//div[contains(@class, "amount")]/span/text()')
-            fare = float(fare_element[0].strip().replace("$", "")) if fare_element else 0.0
+            fare_str = first_text(_AMOUNT(activity))
+            fare = float(fare_str.replace("$", "")) if fare_str else 0.0
 
             # Normalize top-up activities
             if "Top up" in start_point:
                 start_point = "Top Up"
                 end_point = "Opal Travel App"
 
-            travel_data[date_obj].append({
+            day_activities.append({
                 "time": time_str,
+                "minute": minute_of_day,
                 "start_point": start_point,
                 "end_point": end_point,
                 "fare": fare
             })
 
         # Sort activities by time for the given date
-        travel_data[date_obj].sort(key=lambda x: datetime.strptime(x["time"], "%H:%M"))
+        day_activities.sort(key=itemgetter("minute"))
+        records.append((date_obj, day_activities))
 
-    # Return an OrderedDict sorted by date in descending order
-    sorted_travel_data = OrderedDict(
-        (date.strftime("%A %d %b %Y"), travel_data[date])
-        for date in sorted(travel_data.keys(), reverse=True)
-    )
-    return sorted_travel_data
+    # Build the result in date order (descending); dicts keep insertion order
+    records.sort(key=itemgetter(0), reverse=True)
+    return dict(records)
+
+
+def build_activity_array(travel_dict: dict) -> np.ndarray:
+    """
+    Flattens the parsed travel data into a NumPy structured array with one
+    record per activity, so the totals can be computed with array reductions.
+    """
+    records = [
+        (date_obj.date(), activity["fare"], activity["start_point"] == "Top Up")
+        for date_obj, activities in travel_dict.items()
+        for activity in activities
+    ]
+    return np.array(records, dtype=ACTIVITY_DTYPE)
 
 
-def calculate_totals(travel_dict: dict, last_monday: datetime):
+def calculate_totals(activities: np.ndarray, last_monday: datetime):
     """
     Calculates the total top-up and fare charged since the given last Monday.
 
     Returns:
         tuple: (total_top_up, total_fare_charged)
     """
-    total_top_up = 0.0
-    total_fare_charged = 0.0
-    for date_str, activities in travel_dict.items():
-        date_obj = datetime.strptime(date_str, "%A %d %b %Y")
-        if date_obj >= last_monday:
-            for activity in activities:
-                if activity["start_point"] == "Top Up":
-                    total_top_up += activity["fare"]
-                else:
-                    total_fare_charged += activity["fare"]
+    since_monday = activities["date"] >= np.datetime64(last_monday, "D")
+    is_topup = activities["is_topup"]
+    total_top_up = float(activities["fare"][since_monday & is_topup].sum())
+    total_fare_charged = float(activities["fare"][since_monday & ~is_topup].sum())
     return total_top_up, total_fare_charged
 
 
-def get_daily_totals(travel_dict: dict, last_monday: datetime) -> dict:
+def get_daily_totals(activities: np.ndarray, last_monday: datetime) -> dict:
     """
-    Aggregates top-up and fare charges per weekday from travel_dict entries
+    Aggregates top-up and fare charges per weekday from activities
     on or after last_monday.
 
     For travel transactions (non–top-up), we take the absolute value of the fare.
@@ -184,24 +391,21 @@ def get_daily_totals(travel_dict: dict, last_monday: datetime) -> dict:
         dict: A dictionary where keys are weekdays (e.g. "Monday") and values
               are dictionaries with keys "topup" and "fares".
     """
-    daily_totals = {}
-    for date_str, activities in travel_dict.items():
-        # Convert the date string to a datetime object
-        date_obj = datetime.strptime(date_str, "%A %d %b %Y")
-        # Filter out dates before last Monday
-        if date_obj < last_monday:
-            continue
+    activities = activities[activities["date"] >= np.datetime64(last_monday, "D")]
+    # Day 0 of datetime64 (1970-01-01) was a Thursday; shift so that Monday is 0
+    weekdays = (activities["date"].view("i8") + 3) % 7
+    fare = activities["fare"]
+    is_topup = activities["is_topup"]
 
-        weekday = date_obj.strftime("%A")
-        if weekday not in daily_totals:
-            daily_totals[weekday] = {"topup": 0.0, "fares": 0.0}
-        for activity in activities:
-            if activity["start_point"] == "Top Up":
-                daily_totals[weekday]["topup"] += activity["fare"]
-            else:
-                # For travel fares, assume they are negative so we add the absolute value.
-                daily_totals[weekday]["fares"] += abs(activity["fare"])
-    return daily_totals
+    counts = np.bincount(weekdays, minlength=7)
+    topups = np.bincount(weekdays[is_topup], weights=fare[is_topup], minlength=7)
+    # For travel fares, assume they are negative so we add the absolute value.
+    fares = np.bincount(weekdays[~is_topup], weights=np.abs(fare[~is_topup]), minlength=7)
+
+    return {
+        WEEKDAYS[day]: {"topup": float(topups[day]), "fares": float(fares[day])}
+        for day in np.flatnonzero(counts)
+    }
 
 
 def build_table_string(daily_totals: dict) -> str:
@@ -218,15 +422,14 @@ def build_table_string(daily_totals: dict) -> str:
     Returns:
         str: A formatted ASCII table with columns for Weekday, Top Up, and Fares.
     """
-    # Define the display order of weekdays
-    weekdays_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    from tabulate import tabulate
 
     # Prepare rows for tabulate
     rows = []
     total_topup = 0.0
     total_fares = 0.0
 
-    for day in weekdays_order:
+    for day in WEEKDAYS:
         if day in daily_totals:
             topup = daily_totals[day]["topup"]
             fares = daily_totals[day]["fares"]
@@ -246,73 +449,160 @@ def build_table_string(daily_totals: dict) -> str:
     return table_str
 
 
-def main():
-
+def ping_healthcheck(suffix: str = "") -> None:
+    """Pings healthchecks.io; suffix is "/start", "/fail" or "" for success."""
     healthcheck_url = f"https://hc-ping.com/{credentials.HEALTH_CHECK_IO_PING_KEY}/opal-balance"
-
     try:
-        requests.get(healthcheck_url + "/start", timeout=5)
+        _SESSION.get(healthcheck_url + suffix, timeout=5)
     except requests.exceptions.RequestException:
         # If the network request fails for any reason, we don't want
         # it to prevent the main job from running
         pass
 
 
-    driver = initialize_driver()
-    try:
-        login(driver)
-        balance, pending = get_balance(driver)
-        print(f"Balance: {float(balance):.2f}")
-        print(f"Pending Top-Up: {float(pending):.2f}")
+def run_once(driver: webdriver.Chrome) -> dict:
+    """
+    Performs a single balance check with an already running driver.
 
-        travel_html = get_travel_data_html(driver)
-        tree = html.fromstring(travel_html)
-        travel_dict = parse_travel_data(tree)
+    Returns:
+        dict: The results to send to the API (see post_results).
+    """
+    login(driver)
+    balance, pending = get_balance(driver)
+    print(f"Balance: {float(balance):.2f}")
+    print(f"Pending Top-Up: {float(pending):.2f}")
 
-        today = datetime.today()
-        last_monday = today - timedelta(days=today.weekday())
-        last_monday = last_monday.replace(hour=0, minute=0, second=0, microsecond=0)
+    travel_html = get_travel_data_html(driver)
+    travel_dict = parse_travel_data(travel_html)
+    activities = build_activity_array(travel_dict)
 
-        total_top_up, total_fare_charged = calculate_totals(travel_dict, last_monday)
-        topup_needed = 50 -  (balance - total_fare_charged)
+    today = datetime.today()
+    last_monday = today - timedelta(days=today.weekday())
+    last_monday = last_monday.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        if topup_needed < 0:
-            topup_needed = 0
+    total_top_up, total_fare_charged = calculate_totals(activities, last_monday)
+    topup_needed = 50 -  (balance - total_fare_charged)
 
+    if topup_needed < 0:
+        topup_needed = 0
 
-        print(f"Total topped up since last Monday: {float(total_top_up):.2f}")
-        print(f"Total fare charged since last Monday: {float(total_fare_charged):.2f}")
-        print(f"Total top up needed this week: {float(topup_needed):.2f}")
 
+    print(f"Total topped up since last Monday: {float(total_top_up):.2f}")
+    print(f"Total fare charged since last Monday: {float(total_fare_charged):.2f}")
+    print(f"Total top up needed this week: {float(topup_needed):.2f}")
 
 
-        # Compute daily totals for dates on or after last Monday
-        daily_totals = get_daily_totals(travel_dict, last_monday)
 
-        # Build the table string
-        table_str = build_table_string(daily_totals)
+    # Compute daily totals for dates on or after last Monday
+    daily_totals = get_daily_totals(activities, last_monday)
 
-        # Print locally if you want to see it
-        print("\nTravel Activity Summary:")
-        print(table_str)
+    # Build the table string
+    table_str = build_table_string(daily_totals)
+
+    # Print locally if you want to see it
+    print("\nTravel Activity Summary:")
+    print(table_str)
+
+    return {
+        "weekly_fare": total_fare_charged,
+        "opal_balance": balance,
+        "week_top_up": total_top_up,
+        "top_up_needed": f"{float(topup_needed):.2f}",
+    }
 
-        # --- SEND TO YOUR API ---
-        url = credentials.url
-        data = {
-            "weekly_fare": total_fare_charged,
-            "opal_balance": balance,
-            "week_top_up": total_top_up,
-            "top_up_needed": f"{float(topup_needed):.2f}",
-        }
 
-        # If your endpoint expects a POST with query params, you can do:
-        response = requests.post(url, json=data)
+def post_results(data: dict) -> None:
+    """Sends the results of a balance check to the configured API endpoint."""
+    # --- SEND TO YOUR API ---
+    url = credentials.url
 
+    # If your endpoint expects a POST with query params, you can do:
+    response = _SESSION.post(url, json=data, timeout=5)
+
+
+def main():
+    """Runs a single balance check, launching and tearing down Chrome for it."""
+    ping_healthcheck("/start")
+
+    driver = initialize_driver()
+    post_future = None
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        data = run_once(driver)
+        # Send the results while Chrome is shutting down rather than after it
+        post_future = executor.submit(post_results, data)
     finally:
         driver.quit()
+        executor.shutdown()
+
+    # Re-raises if the POST failed
+    post_future.result()
 
     # Signal success:
-    requests.get(healthcheck_url)
+    ping_healthcheck()
+
+
+def serve(interval: float = SERVE_INTERVAL_SECONDS) -> None:
+    """
+    Keeps a single Chrome instance alive and runs a balance check every `interval` seconds.
+
+    This avoids paying Chrome's cold-start cost on every check. The login session is
+    carried over between iterations through the persistent user-data-dir profile.
+    """
+    driver = initialize_driver()
+    try:
+        while True:
+            ping_healthcheck("/start")
+            try:
+                if driver is None:
+                    driver = initialize_driver()
+                post_results(run_once(driver))
+            except Exception:
+                # Don't let a single failed check take the daemon down
+                traceback.print_exc()
+                ping_healthcheck("/fail")
+                # Timeouts and script errors leave Chrome usable; only restart it if it's gone
+                if not driver_is_alive(driver):
+                    quit_driver_quietly(driver)
+                    driver = None
+            else:
+                ping_healthcheck()
+            time.sleep(interval)
+    finally:
+        quit_driver_quietly(driver)
+
+
+def driver_is_alive(driver) -> bool:
+    """Returns whether the driver still has a working browser session."""
+    if driver is None:
+        return False
+    try:
+        # Fails with InvalidSessionIdException, NoSuchWindowException etc. once Chrome is gone
+        driver.current_url
+    except WebDriverException:
+        return False
+    return True
+
+
+def quit_driver_quietly(driver) -> None:
+    """Quits the driver, ignoring errors from a browser that has already gone away."""
+    if driver is None:
+        return
+    try:
+        driver.quit()
+    except WebDriverException:
+        pass
+
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Check the Opal card balance and weekly travel.")
+    parser.add_argument("--serve", action="store_true",
+                        help="keep Chrome running and check the balance on a schedule")
+    parser.add_argument("--interval", type=float, default=SERVE_INTERVAL_SECONDS,
+                        help="seconds between checks when running with --serve")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.interval)
+    else:
+        main()
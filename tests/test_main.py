@@ -0,0 +1,120 @@
+import os
+from datetime import datetime
+
+from selenium.common.exceptions import InvalidSessionIdException
+
+import main
+
+# Angular renders <!----> comment anchors ahead of a node's visible text
+COMMENT_ANCHORED_HTML = """
+<div>
+  <div class="activity-by-date-container">
+    <div class="activity-date"><!---->Monday 12 Oct 2026</div>
+    <ul>
+      <li class="ng-star-inserted">
+        <div class="date"><!---->17:05</div>
+        <span class="from"><!---->Central</span>
+        <span class="to"><!---->Town Hall</span>
+        <div class="amount"><span><!---->-$3.20</span></div>
+      </li>
+      <li class="ng-star-inserted">
+        <div class="date">08:30</div>
+        <span class="from"><i class="icon"></i>Top up via app</span>
+        <div class="amount"><span><!---->$20.00</span></div>
+      </li>
+    </ul>
+  </div>
+</div>
+"""
+
+
+def test_parse_travel_data_reads_text_after_comment_anchors():
+    travel_dict = main.parse_travel_data(COMMENT_ANCHORED_HTML)
+
+    assert travel_dict == {
+        datetime(2026, 10, 12): [
+            {"time": "08:30", "minute": 510, "start_point": "Top Up",
+             "end_point": "Opal Travel App", "fare": 20.0},
+            {"time": "17:05", "minute": 1025, "start_point": "Central",
+             "end_point": "Town Hall", "fare": -3.2},
+        ]
+    }
+
+
+def test_parse_travel_data_tolerates_blank_or_malformed_times():
+    travel_html = """
+    <div class="activity-by-date-container">
+      <div class="activity-date">Tuesday 13 Oct 2026</div>
+      <ul>
+        <li class="ng-star-inserted">
+          <div class="date">
+            <!---->17:05</div>
+          <span class="from">Central</span><span class="to">Redfern</span>
+          <div class="amount"><span>-$2.10</span></div>
+        </li>
+        <li class="ng-star-inserted">
+          <div class="date">soon</div>
+          <span class="from">Redfern</span><span class="to">Central</span>
+          <div class="amount"><span>-$2.10</span></div>
+        </li>
+      </ul>
+    </div>
+    """
+    activities = main.parse_travel_data(travel_html)[datetime(2026, 10, 13)]
+
+    assert [(a["time"], a["minute"]) for a in activities] == [("", 0), ("soon", 0)]
+
+
+def test_cached_driver_path_round_trip(tmp_path, monkeypatch):
+    driver_path = tmp_path / "chromedriver"
+    driver_path.write_text("")
+    monkeypatch.setattr(main, "DRIVER_CACHE_PATH", str(tmp_path / "driver.json"))
+    monkeypatch.delenv(main.CHROMEDRIVER_ENV_VAR, raising=False)
+
+    main.save_cached_driver_path(str(driver_path))
+    assert main.load_cached_driver_path() == str(driver_path)
+
+    # A replaced binary invalidates the cache
+    os.utime(driver_path, (0, 0))
+    assert main.load_cached_driver_path() is None
+
+
+class FakeDriver:
+    def __init__(self, error=None):
+        self.error = error
+
+    @property
+    def current_url(self):
+        if self.error:
+            raise self.error
+        return "https://example.invalid/"
+
+
+def test_driver_is_alive_only_false_once_the_session_is_gone():
+    assert main.driver_is_alive(FakeDriver())
+    assert not main.driver_is_alive(FakeDriver(InvalidSessionIdException("invalid session id")))
+    assert not main.driver_is_alive(None)
+
+
+def test_totals_exclude_dates_before_last_monday_and_map_weekdays():
+    def activity(start_point, fare):
+        return {"time": "09:00", "minute": 540, "start_point": start_point,
+                "end_point": "Central", "fare": fare}
+
+    # last_monday is Monday 12 Oct; the 9th (Friday) and 11th (Sunday) fall before it
+    travel_dict = {
+        datetime(2026, 10, 18): [activity("Wynyard", -4.0)],
+        datetime(2026, 10, 14): [activity("Top Up", 10.0), activity("Redfern", -2.5)],
+        datetime(2026, 10, 12): [activity("Town Hall", -1.5)],
+        datetime(2026, 10, 11): [activity("Top Up", 40.0), activity("Bondi", -8.0)],
+        datetime(2026, 10, 9): [activity("Manly", -7.0)],
+    }
+    activities = main.build_activity_array(travel_dict)
+    last_monday = datetime(2026, 10, 12)
+
+    assert main.calculate_totals(activities, last_monday) == (10.0, -8.0)
+    assert main.get_daily_totals(activities, last_monday) == {
+        "Monday": {"topup": 0.0, "fares": 1.5},
+        "Wednesday": {"topup": 10.0, "fares": 2.5},
+        "Sunday": {"topup": 0.0, "fares": 4.0},
+    }